@@ -17,8 +17,6 @@ if _BACKEND_DIR not in sys.path:
 
 # Import the local excel_subtable_extractor (now in backend directory)
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -241,6 +239,8 @@ def get_subtables_summary(api_response: Dict[str, Any]) -> Dict[str, Any]:
 
 # Example usage and testing
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     # Test the API function
     excel_file = "【修正】水沢橋　積算書.xlsx"
 
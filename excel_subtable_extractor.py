@@ -10,8 +10,6 @@ from typing import List, Dict, Tuple, Optional
 import logging
 from table_title_extractor import extract_excel_table_title_items, find_excel_table_end
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -446,6 +444,8 @@ def extract_subtables_from_excel(excel_file_path: str, sheet_name: str = None) -
 
 # Example usage and testing
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     # Test with the provided Excel file
     excel_file = "【修正】水沢橋　積算書.xlsx"
 
@@ -8,8 +8,6 @@ from dataclasses import dataclass, asdict
 import pandas as pd
 import tempfile
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create Router
@@ -1,8 +1,10 @@
 import os
+import logging
 import uvicorn
 from fastapi import FastAPI
 from dotenv import load_dotenv
 from mangum import Mangum
+
 from server.api.login import router as login_router
 from server.api.projects import router as projects_router
 from server.api.tender import router as tender_router
@@ -10,6 +12,9 @@ from excel_verification_api import excel_verification_router
 
 from fastapi.middleware.cors import CORSMiddleware
 
+# The routers and services only create module loggers; configure logging once here
+logging.basicConfig(level=logging.INFO)
+
 load_dotenv()
 
 app = FastAPI(title="Coseb Project Management")
@@ -22,8 +22,6 @@ if backend_dir not in sys.path:
 
 # Import the new API-ready subtable extractor (from backend/excel_subtable_api.py)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
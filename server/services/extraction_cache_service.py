@@ -11,8 +11,6 @@ from typing import Dict, List, Optional, Any
 from threading import Lock
 from ..schemas.tender import TenderItem, SubtableItem
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
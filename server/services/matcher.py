@@ -5,8 +5,6 @@ from rapidfuzz import process, fuzz
 from ..schemas.tender import TenderItem, SubtableItem, ComparisonResult, ComparisonSummary, SubtableComparisonResult
 from .normalizer import Normalizer
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -1,8 +1,10 @@
-from subtable_pdf_extractor import SubtablePDFExtractor
+from subtable_pdf_extractor import SubtablePDFExtractor, _HEADER_NOISE_TABLE, _THOUSANDS_SEP_TABLE
 import pdfplumber
+from pdfplumber.table import TableSettings
 import os
 import re
 import logging
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional, Union
 from ..schemas.tender import TenderItem, SubtableItem
 
@@ -10,10 +12,102 @@ from ..schemas.tender import TenderItem, SubtableItem
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Substrings that identify a main-table header row
+_HEADER_INDICATORS = ("名称", "工種", "数量", "単位")
+_HEADER_INDICATOR_RE = re.compile("|".join(_HEADER_INDICATORS))
+
+# Fields that identify a main-table item, per project area
+_IWATE_IDENTIFYING_FIELDS = frozenset(("工事区分・工種・種別・細別", "規格", "摘要"))
+_IDENTIFYING_FIELDS = {
+    "北上市": frozenset(("費目・工種・種別・細", "明細単価番号")),
+    # 農政では最低限、工種・種目 or 摘要/備考/規格のいずれかで識別
+    "農政": frozenset(("工種・種目", "規格", "備考", "摘要")),
+}
+
+# Header normalization deletes the subtable extractor's header noise
+# plus the half-width middle dot
+_HEADER_CLEAN_TABLE = {**_HEADER_NOISE_TABLE, ord("･"): None}
+
+
+# Patterns used per cell in the row/quantity loops, compiled once at import
+_QTY_RE = re.compile(r'[\d.]+')
+_NUMBER_RE = re.compile(r'(\d+\.?\d*)')
+_DECIMAL_RE = re.compile(r'(\d+)\.(\d+)')
+_ZERO_DECIMAL_RE = re.compile(r'0\.(\d+)')
+_DOT_DECIMAL_RE = re.compile(r'\.(\d+)')
+_DIGITS_RE = re.compile(r'^\d+$')
+_PLAIN_NUMBER_RE = re.compile(r"^\d+(?:\.\d+)?$")
+_WHITESPACE_RE = re.compile(r'\s+')
+_LEADING_WS_RE = re.compile(r"^\s+")
+_LEADING_DOTS_RE = re.compile(r"^[・･]+\s*")
+# Column kinds for the main-table row loop; anything not listed is copied as-is
+_COL_RAW, _COL_QTY, _COL_UNIT = 0, 1, 2
+_COL_KINDS = {"数量": _COL_QTY, "単位": _COL_UNIT}
+# Units recognised when inferring 農政 columns from cell contents
+_NOUSEI_UNITS = frozenset((
+    "m3", "m2", "m", "㎥", "㎡", "ｍ", "mm", "㎜", "cm", "㎝",
+    "枚", "箇所", "kg", "本", "人", "日", "ha", "掛㎡", "孔", "ton", "式", "基", "台",
+    "Ｌ", "L", "台･日", "台・日"
+))
+# Item-key fields in priority order; 規格 is appended separately
+_ITEM_KEY_FIELDS = ("工種・種目", "工事区分・工種・種別・細別", "摘要", "備考")
+# Fields never used as the fallback merge key for spanning rows
+_NON_KEY_FIELDS = frozenset(("単位", "数量", "単価", "金額", "規格"))
+# Letters, "=", parentheses, units (kN, m, t) or 号/明 mark description text
+_DESCRIPTION_RE = re.compile(r'[A-Za-z=()kNmt号明]')
+
+
+def _clean_header_text(text: str) -> str:
+    """Remove whitespace and middle dots so header variants compare equal."""
+    return (text or "").translate(_HEADER_CLEAN_TABLE)
+
+
+def _join_header_cells(row: List) -> str:
+    """Non-empty cells joined by a separator no header pattern contains, so matches stay within a cell."""
+    return "\x1f".join(str(cell) for cell in row if cell)
+
+
+def _compile_column_patterns(column_patterns: Dict[str, List[str]]) -> Dict[str, re.Pattern]:
+    """One alternation regex per column: a search hits iff some pattern is a substring."""
+    return {col_name: re.compile("|".join(map(re.escape, patterns)))
+            for col_name, patterns in column_patterns.items()}
+
+
+@lru_cache(maxsize=2048)
+def _parse_quantity(value_str: str) -> float:
+    """Standard (Iwate) quantity parse; cached because the same cell values recur across rows."""
+    value_str = value_str.replace(",", "")
+    # Fast path: most cells are plain numbers like "1234.5"
+    if value_str.replace(".", "", 1).isdecimal():
+        return float(value_str)
+    number_match = _QTY_RE.search(value_str)
+    if number_match:
+        try:
+            return float(number_match.group())
+        except ValueError:
+            pass
+    return 0.0
+
+
+def _requested_page_numbers(start_page: Optional[int], end_page: Optional[int]) -> Optional[List[int]]:
+    """1-based page numbers for pdfplumber.open(pages=...); None means "through the last page".
+
+    pdfplumber still walks the whole page tree (PDFPage.create_pages) to find
+    these pages; the filter only skips building Page objects for the others.
+    """
+    if end_page is None:
+        return None
+    return list(range(max(1, start_page or 1), end_page + 1))
+
+
+def _pages_from(pdf, start_page: Optional[int]) -> list:
+    """Pages of an opened PDF from start_page (1-based) onwards."""
+    if start_page is None:
+        return pdf.pages
+    return [page for page in pdf.pages if page.page_number >= start_page]
+
 
 class PDFParser:
     def __init__(self):
@@ -50,67 +144,117 @@ class PDFParser:
 
         self.column_patterns = self.default_column_patterns.copy()
 
+        # Header cells are matched against each column's patterns in a single regex pass
+        self._column_pattern_res = _compile_column_patterns(self.column_patterns)
+        self._kitakami_column_pattern_res = _compile_column_patterns(
+            self.kitakami_column_patterns)
+        self._nousei_column_pattern_res = _compile_column_patterns(
+            self.nousei_column_patterns)
+        self._nousei_clean_patterns = {
+            col_name: [_clean_header_text(p) for p in patterns]
+            for col_name, patterns in self.nousei_column_patterns.items()
+        }
+
+        # Tender PDFs use ruled tables; pin the line-based strategy explicitly and
+        # resolve it once instead of on every extract_tables() call
+        self._table_settings = TableSettings.resolve({
+            "vertical_strategy": "lines",
+            "horizontal_strategy": "lines",
+            "snap_tolerance": 3,
+            "join_tolerance": 3,
+            "edge_min_length": 3,
+            "min_words_vertical": 3,
+            "min_words_horizontal": 1,
+            "intersection_tolerance": 3,
+        })
+
+        # Header rows repeat on every page; memoize mappings per header layout
+        self._column_mapping_cache: Dict[Tuple[str, Tuple[str, ...]], Dict[str, int]] = {}
+
+        # extract_tables() is the most expensive pdfplumber call; 農政 runs the main
+        # and subtable passes over the same pages, so keep results per (file, page)
+        self._tables_cache: Dict[Tuple[str, int], List[List[List]]] = {}
+
+        # Total page count per file, so the subtable pass need not reopen the
+        # PDF just to clamp its page range
+        self._page_counts: Dict[str, int] = {}
+
     def extract_tables_with_range(self, pdf_path: str, start_page: Optional[int] = None, end_page: Optional[int] = None, project_area: str = "岩手") -> List[TenderItem]:
         """
         Extract tables from PDF iteratively with specified page range.
         This is the main entry point for parsing the main table.
         """
         all_items = []
-        logger.info(f"Starting PDF extraction from: {pdf_path}")
-        logger.info(
-            f"Page range: {start_page or 'start'} to {end_page or 'end'}")
-        logger.info(f"Project area: {project_area}")
+        logger.info("Starting PDF extraction from: %s", pdf_path)
+        logger.info("Page range: %s to %s",
+                    start_page or 'start', end_page or 'end')
+        logger.info("Project area: %s", project_area)
 
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
-                logger.info(f"PDF has {total_pages} pages total")
-
-                actual_start = (
-                    start_page - 1) if start_page is not None else 0
-                actual_end = (
-                    end_page - 1) if end_page is not None else total_pages - 1
-
-                actual_start = max(0, actual_start)
-                actual_end = min(total_pages - 1, actual_end)
-
-                if actual_start > actual_end:
+            with pdfplumber.open(pdf_path, pages=_requested_page_numbers(start_page, end_page)) as pdf:
+                pages = _pages_from(pdf, start_page)
+                if not pages:
                     logger.warning(
-                        f"Invalid page range: start={actual_start+1}, end={actual_end+1}")
+                        "Invalid page range: start=%s, end=%s", start_page, end_page)
                     return all_items
 
+                if end_page is None:
+                    # Opened without a page filter, so this is the full document
+                    self._page_counts[pdf_path] = len(pdf.pages)
+
+                actual_start = pages[0].page_number - 1
+                actual_end = pages[-1].page_number - 1
+
                 logger.info(
-                    f"Processing pages {actual_start + 1} to {actual_end + 1}")
+                    "Processing pages %d to %d", actual_start + 1, actual_end + 1)
 
                 # Initialize Nousei global header mapping for this extraction session
                 self._nousei_global_cols = None
 
-                for page_num in range(actual_start, actual_end + 1):
-                    page = pdf.pages[page_num]
+                for page in pages:
+                    page_num = page.page_number - 1
                     logger.info(
-                        f"Processing page {page_num + 1}/{total_pages}")
+                        "Processing page %d (range %d-%d)", page_num + 1, actual_start + 1, actual_end + 1)
                     page_items = self._extract_tables_from_page(
-                        page, page_num, project_area)
+                        page, page_num, project_area, pdf_path)
                     all_items.extend(page_items)
 
         except Exception as e:
             logger.error(
-                f"Error processing PDF for main table: {e}", exc_info=True)
+                "Error processing PDF for main table: %s", e, exc_info=True)
             raise
         return all_items
 
-    def _extract_tables_from_page(self, page, page_num: int, project_area: str = "岩手") -> List[TenderItem]:
+    def _get_tables(self, page, pdf_path: Optional[str], page_num: int) -> List[List[List]]:
+        """Return page.extract_tables(), memoized per (pdf_path, page_num) when a path is given."""
+        if pdf_path is None:
+            return page.extract_tables(self._table_settings)
+        key = (pdf_path, page_num)
+        tables = self._tables_cache.get(key)
+        if tables is None:
+            tables = page.extract_tables(self._table_settings)
+            self._tables_cache[key] = tables
+        return tables
+
+    def _extract_tables_from_page(self, page, page_num: int, project_area: str = "岩手", pdf_path: Optional[str] = None) -> List[TenderItem]:
         """Extract all tables from a single page."""
         page_items = []
         try:
-            tables = page.extract_tables()
-            logger.info(f"Found {len(tables)} tables on page {page_num + 1}")
+            # Pages without a text layer (scans, blank or drawing-only pages) can only
+            # yield tables of empty cells, which produce no main-table items.
+            # The 農政 subtable pass still reads them: an empty row there ends a block.
+            if not page.chars:
+                logger.info(
+                    "Page %d has no text layer, skipping table extraction", page_num + 1)
+                return page_items
+            tables = self._get_tables(page, pdf_path, page_num)
+            logger.info("Found %d tables on page %d", len(tables), page_num + 1)
             for table_num, table in enumerate(tables):
                 page_items.extend(self._process_single_table(
                     table, page_num, table_num, project_area))
         except Exception as e:
             logger.error(
-                f"Error processing page {page_num + 1}: {e}", exc_info=True)
+                "Error processing page %d: %s", page_num + 1, e, exc_info=True)
         return page_items
 
     def _process_single_table(self, table: List[List], page_num: int, table_num: int, project_area: str = "岩手") -> List[TenderItem]:
@@ -128,8 +272,12 @@ class PDFParser:
             header_idx = 0
 
         # Determine effective project area from header if possible
+        # Stringify the header once for both the area detection and the pre-check
+        header_text = _join_header_cells(header_row)
         effective_area = self._detect_project_area_from_header(
-            header_row) or project_area
+            header_row, header_text) or project_area
+        if effective_area != "農政" and not self._should_process_table(header_row, header_text):
+            return items
 
         # Build column mapping (attempt with effective area first, then fallback to other patterns)
         if effective_area == "農政" and getattr(self, "_nousei_global_cols", None):
@@ -140,17 +288,13 @@ class PDFParser:
         # 『単位』と『数量』が同時に現れる行をヘッダとして再評価
         if effective_area == "農政" and not col_indices:
             try:
-                import re as _re
-
-                def _clean(s: str) -> str:
-                    return _re.sub(r"[\s\u3000・･]+", "", s or "")
                 scan_limit = min(6, len(table))
                 best_idx = -1
                 for i in range(0, scan_limit):
                     row = table[i]
                     if not row:
                         continue
-                    texts = [_clean(str(c)) for c in row if c]
+                    texts = [_clean_header_text(str(c)) for c in row if c]
                     if any("単位" in t for t in texts) and any("数量" in t for t in texts):
                         best_idx = i
                         break
@@ -207,7 +351,7 @@ class PDFParser:
             # Helper: trim all leading whitespace (Unicode aware)
             def _lstrip_all_ws(text: str) -> str:
                 try:
-                    return re.sub(r"^\s+", "", text or "")
+                    return _LEADING_WS_RE.sub("", text or "")
                 except Exception:
                     return (text or "").lstrip()
 
@@ -282,7 +426,7 @@ class PDFParser:
                     # Expose item name without leading dotted markers used only for classification
                     try:
                         display_name = str(name).lstrip(' \t\u3000')
-                        display_name = re.sub(r"^[・･]+\s*", "", display_name)
+                        display_name = _LEADING_DOTS_RE.sub("", display_name)
                     except Exception:
                         display_name = name
                     raw_fields["工種・種目"] = display_name
@@ -306,17 +450,11 @@ class PDFParser:
                     try:
                         def looks_like_unit(text: str) -> bool:
                             t = (text or "").strip()
-                            return t in [
-                                "m3", "m2", "m", "㎥", "㎡", "ｍ", "mm", "㎜", "cm", "㎝",
-                                "枚", "箇所", "kg", "本", "人", "日", "ha", "掛㎡", "孔", "ton", "式", "基", "台",
-                                "Ｌ", "L", "台･日", "台・日"
-                            ]
+                            return t in _NOUSEI_UNITS
 
                         def looks_like_quantity(text: str) -> bool:
-                            import re as _re2
-                            t = (text or "").replace(
-                                ',', '').replace('，', '').strip()
-                            return bool(_re2.match(r"^\d+(?:\.\d+)?$", t))
+                            t = (text or "").translate(_THOUSANDS_SEP_TABLE).strip()
+                            return bool(_PLAIN_NUMBER_RE.match(t))
 
                         # index of the dotted name cell
                         dotted_idx = None
@@ -359,8 +497,7 @@ class PDFParser:
                                 cell = row[ci]
                                 if not cell:
                                     continue
-                                t = str(cell).replace(
-                                    ',', '').replace('，', '').strip()
+                                t = str(cell).translate(_THOUSANDS_SEP_TABLE).strip()
                                 if looks_like_quantity(t):
                                     raw_fields["数量"] = t
                                     break
@@ -376,8 +513,7 @@ class PDFParser:
                     qtext = raw_fields.get("数量") or ""
                     if qtext:
                         try:
-                            qty_val = float(qtext.replace(
-                                ',', '').replace('，', ''))
+                            qty_val = float(qtext.translate(_THOUSANDS_SEP_TABLE))
                         except Exception:
                             qty_val = 0.0
                     unit_val = raw_fields.get("単位") or None
@@ -418,50 +554,65 @@ class PDFParser:
                         in_subtable_after_triple = True
                 except Exception as e:
                     logger.error(
-                        f"Error processing Nousei main row {row_idx + 1} in table {table_num + 1}: {e}", exc_info=True)
+                        "Error processing Nousei main row %d in table %d: %s", row_idx + 1, table_num + 1, e, exc_info=True)
             return items
-        for row_idx, row in enumerate(data_rows):
+        # Stringify and strip every cell once; the row helpers below rely on it
+        stripped_rows = [[str(c).strip() if c else "" for c in r]
+                         for r in data_rows]
+        col_plan = self._build_column_plan(col_indices)
+        # Rows are collected as plain dicts so continuation rows can be merged
+        # into them cheaply; TenderItem models are built once per table
+        pending: List[Dict] = []
+        for row_idx, row in enumerate(stripped_rows):
             try:
                 result = self._process_single_row_with_spanning(
-                    row, col_indices, page_num, table_num, header_idx + 1 + row_idx, items, effective_area)
-                if isinstance(result, TenderItem):
-                    items.append(result)
+                    row, col_indices, page_num, table_num, header_idx + 1 + row_idx, pending, effective_area, col_plan)
+                if isinstance(result, dict):
+                    pending.append(result)
             except Exception as e:
                 logger.error(
-                    f"Error processing row {row_idx + 1} in table {table_num + 1}: {e}", exc_info=True)
-        return items
+                    "Error processing row %d in table %d: %s", row_idx + 1, table_num + 1, e, exc_info=True)
+        # Every field is already a str/float/None of the declared type, so skip validation
+        return [TenderItem.model_construct(**fields) for fields in pending]
 
     def _process_single_row_with_spanning(self, row: List, col_indices: Dict[str, int],
                                           page_num: int, table_num: int, row_num: int,
-                                          existing_items: List, project_area: str = "岩手") -> Union[TenderItem, str, None]:
-        """Handles row spanning for the main table."""
-        if self._is_completely_empty_row(row):
-            return "skipped"
+                                          existing_items: List, project_area: str = "岩手",
+                                          col_plan: Optional[Tuple[Tuple[int, str, int], ...]] = None) -> Union[Dict, str]:
+        """Handles row spanning for the main table. Expects pre-stripped string cells.
 
+        Returns the new item's TenderItem fields as a dict, or "merged"/"skipped"
+        when the row was folded into existing_items[-1] or ignored.
+        """
         raw_fields, quantity, unit = self._extract_fields_from_row(
-            row, col_indices, project_area)
+            row, col_indices, project_area, col_plan)
 
-        has_item_fields = self._has_item_identifying_fields(
-            raw_fields, project_area)
-        has_quantity_data = quantity > 0 or "単位" in raw_fields
+        # raw_fields only holds non-empty values, so key presence is enough
+        identifying_fields = _IDENTIFYING_FIELDS.get(
+            project_area, _IWATE_IDENTIFYING_FIELDS)
+        has_item_fields = not raw_fields.keys().isdisjoint(identifying_fields)
 
-        if has_item_fields and not has_quantity_data:
+        if has_item_fields:
+            # quantity is 0.0 whenever the row carries no quantity data
             item_key = self._create_item_key_from_fields(raw_fields)
             if not item_key:
                 return "skipped"
-            return TenderItem(item_key=item_key, raw_fields=raw_fields, quantity=0.0, unit=unit, source="PDF", page_number=page_num + 1)
-        elif has_quantity_data and not has_item_fields:
+            return {"item_key": item_key, "raw_fields": raw_fields, "quantity": quantity,
+                    "unit": unit, "source": "PDF", "page_number": page_num + 1}
+        if quantity > 0 or "単位" in raw_fields:
             return self._complete_previous_item_with_quantity_data(existing_items, raw_fields, quantity)
-        elif has_item_fields and has_quantity_data:
-            item_key = self._create_item_key_from_fields(raw_fields)
-            if not item_key:
-                return "skipped"
-            return TenderItem(item_key=item_key, raw_fields=raw_fields, quantity=quantity, unit=unit, source="PDF", page_number=page_num + 1)
-        else:
-            return "skipped"
-
-    def _extract_fields_from_row(self, row: List, col_indices: Dict[str, int], project_area: str = "岩手") -> Tuple[Dict[str, str], float, Optional[str]]:
-        """Extracts all relevant fields from a single row."""
+        # Empty rows end up here too: no mapped cell yields a field
+        return "skipped"
+
+    @staticmethod
+    def _build_column_plan(col_indices: Dict[str, int]) -> Tuple[Tuple[int, str, int], ...]:
+        """(index, name, kind) per mapped column, built once per table for the row loop."""
+        return tuple((col_idx, col_name, _COL_KINDS.get(col_name, _COL_RAW))
+                     for col_name, col_idx in col_indices.items())
+
+    def _extract_fields_from_row(self, row: List, col_indices: Dict[str, int], project_area: str = "岩手",
+                                 col_plan: Optional[Tuple[Tuple[int, str, int], ...]] = None) -> Tuple[Dict[str, str], float, Optional[str]]:
+        """Extracts all relevant fields from a single pre-stripped row."""
         raw_fields = {}
         quantity = 0.0
         unit = None
@@ -469,82 +620,94 @@ class PDFParser:
         # For Kitakami projects, ignore rows with "合計" (total) in the item name
         if project_area == "北上市":
             item_name_col = col_indices.get("費目・工種・種別・細", 0)
-            if item_name_col < len(row) and row[item_name_col]:
-                item_name = str(row[item_name_col]).strip()
-                if "合計" in item_name:
+            if item_name_col < len(row):
+                if "合計" in row[item_name_col]:
                     # Return empty fields for total rows
                     return {}, 0.0, None
 
-        for col_name, col_idx in col_indices.items():
-            if col_idx < len(row) and row[col_idx]:
-                cell_value = str(row[col_idx]).strip()
-                if cell_value:
-                    if col_name == "数量":
-                        if project_area == "北上市":
-                            # For Kitakami, pass row and column index for adjacent column reconstruction
-                            quantity = self._extract_kitakami_quantity(
-                                cell_value, row, col_idx)
-                        else:
-                            quantity = self._extract_quantity(
-                                cell_value, project_area)
-                    elif col_name == "単位":
-                        unit = cell_value
-                    raw_fields[col_name] = cell_value
+        if col_plan is None:
+            col_plan = self._build_column_plan(col_indices)
+        row_len = len(row)
+        for col_idx, col_name, kind in col_plan:
+            if col_idx < row_len and row[col_idx]:
+                cell_value = row[col_idx]
+                if kind == _COL_QTY:
+                    if project_area == "北上市":
+                        # For Kitakami, pass row and column index for adjacent column reconstruction
+                        quantity = self._extract_kitakami_quantity(
+                            cell_value, row, col_idx)
+                    else:
+                        quantity = self._extract_quantity(
+                            cell_value, project_area)
+                elif kind == _COL_UNIT:
+                    unit = cell_value
+                raw_fields[col_name] = cell_value
         return raw_fields, quantity, unit
 
-    def _has_item_identifying_fields(self, raw_fields: Dict[str, str], project_area: str = "岩手") -> bool:
-        """Checks if the row contains fields that identify an item."""
-        if project_area == "北上市":
-            # Kitakami-specific identifying fields
-            identifying_fields = ["費目・工種・種別・細", "明細単価番号"]
-        elif project_area == "農政":
-            # 農政では最低限、工種・種目 or 摘要/備考/規格のいずれかで識別
-            identifying_fields = ["工種・種目", "規格", "備考", "摘要"]
-        else:
-            # Iwate-specific identifying fields
-            identifying_fields = ["工事区分・工種・種別・細別", "規格", "摘要"]
-        return any(field in raw_fields and raw_fields[field] for field in identifying_fields)
-
-    def _complete_previous_item_with_quantity_data(self, existing_items: List[TenderItem],
+    def _complete_previous_item_with_quantity_data(self, existing_items: List[Dict],
                                                    raw_fields: Dict[str, str], quantity: float) -> str:
-        """Completes the previous incomplete item with quantity and unit data."""
-        if not existing_items or existing_items[-1].quantity > 0:
+        """Completes the previous incomplete item (a pending field dict) with quantity and unit data."""
+        if not existing_items or existing_items[-1]["quantity"] > 0:
             return "skipped"
         last_item = existing_items[-1]
-        last_item.quantity = quantity
+        last_item["quantity"] = quantity
         if "単位" in raw_fields:
-            last_item.unit = raw_fields["単位"]
-        for k, v in raw_fields.items():
-            if k not in last_item.raw_fields:
-                last_item.raw_fields[k] = v
+            last_item["unit"] = raw_fields["単位"]
+        last_fields = last_item["raw_fields"]
+        # Add only the fields the item lacks, in a single C-level merge: existing
+        # keys keep their order and (non-empty) values, new keys follow in row order
+        last_item["raw_fields"] = {**last_fields, **raw_fields, **last_fields}
         return "merged"
 
     def _is_completely_empty_row(self, row: List) -> bool:
         """Checks if all cells in the row are empty or contain only whitespace."""
-        return not any(cell and str(cell).strip() for cell in row)
+        # isspace() answers the same question as strip() without allocating a copy
+        return not any(cell and (s := str(cell)) and not s.isspace() for cell in row)
 
     def _create_item_key_from_fields(self, raw_fields: Dict[str, str]) -> str:
         """Creates a concatenated item key using space concatenation (consistent with Excel)."""
-        key_fields = ["工種・種目", "工事区分・工種・種別・細別", "摘要", "備考"]
         base_key = next(
-            (raw_fields[f] for f in key_fields if f in raw_fields and raw_fields[f]), None)
+            (v for f in _ITEM_KEY_FIELDS if (v := raw_fields.get(f))), None)
         if not base_key:
-            base_key = next((v for k, v in raw_fields.items() if v and k not in [
-                            "単位", "数量", "単価", "金額", "規格"]), "")
+            base_key = next((v for k, v in raw_fields.items() if v and k not in _NON_KEY_FIELDS), "")
 
         # Use space concatenation instead of + to match Excel behavior
-        if "規格" in raw_fields and raw_fields["規格"]:
-            return f"{base_key} {raw_fields['規格']}".strip()
+        spec = raw_fields.get("規格")
+        if spec:
+            return f"{base_key} {spec}".strip()
         return base_key
 
     def _find_header_row(self, table: List[List]) -> Tuple[Optional[List], int]:
         """Finds the header row in the table."""
         for i, row in enumerate(table[:10]):
-            if row and any(any(indicator in str(cell) for indicator in ["名称", "工種", "数量", "単位"]) for cell in row):
+            if not row:
+                continue
+            # One scan of the joined row instead of one per indicator
+            if _HEADER_INDICATOR_RE.search(_join_header_cells(row)):
                 return row, i
         return (table[0], 0) if table else (None, -1)
 
+    def _should_process_table(self, header_row: List, header_text: Optional[str] = None) -> bool:
+        """Cheap pre-check: non-Nousei mappings need both 数量 and 単位 in the header row."""
+        if header_text is None:
+            header_text = _join_header_cells(header_row)
+        return all(
+            any(p in header_text for patterns in (self.column_patterns, self.kitakami_column_patterns)
+                for p in patterns[col_name])
+            for col_name in ("数量", "単位")
+        )
+
     def _get_column_mapping(self, header_row: List, project_area: str = "岩手") -> Dict[str, int]:
+        """Maps column names to indices based on header row (cached per header layout)."""
+        key = (project_area, tuple(str(c) if c else "" for c in header_row))
+        col_indices = self._column_mapping_cache.get(key)
+        if col_indices is None:
+            col_indices = self._compute_column_mapping(header_row, project_area)
+            self._column_mapping_cache[key] = col_indices
+        # Hand out a copy so callers can never mutate the cached mapping
+        return dict(col_indices)
+
+    def _compute_column_mapping(self, header_row: List, project_area: str = "岩手") -> Dict[str, int]:
         """Maps column names to indices based on header row."""
         col_indices = {}
 
@@ -552,34 +715,28 @@ class PDFParser:
         pattern_sets = []
         if project_area == "北上市":
             pattern_sets = [
-                self.kitakami_column_patterns, self.column_patterns]
+                self._kitakami_column_pattern_res, self._column_pattern_res]
         elif project_area == "農政":
             # Restrict matching to 農政-specific patterns only, to avoid affecting other formats
-            pattern_sets = [self.nousei_column_patterns]
+            pattern_sets = [self._nousei_column_pattern_res]
         else:
-            pattern_sets = [self.column_patterns,
-                            self.kitakami_column_patterns]
+            pattern_sets = [self._column_pattern_res,
+                            self._kitakami_column_pattern_res]
 
+        cell_texts = [(i, str(cell)) for i, cell in enumerate(header_row) if cell]
         for patterns_to_use in pattern_sets:
             tentative = {}
-            for col_name, patterns in patterns_to_use.items():
-                for i, cell in enumerate(header_row):
-                    if not cell:
-                        continue
-                    cell_text = str(cell)
+            for col_name, pattern_re in patterns_to_use.items():
+                for i, cell_text in cell_texts:
                     # Direct inclusion match
-                    if any(p in cell_text for p in patterns):
+                    if pattern_re.search(cell_text):
                         tentative[col_name] = i
                         break
                     # Normalized match only for 農政 (remove spaces/full-width spaces and middle dots)
                     if project_area == "農政":
                         try:
-                            import re as _re
-
-                            def _clean(s: str) -> str:
-                                return _re.sub(r"[\s\u3000・･]+", "", s)
-                            clean_cell = _clean(cell_text)
-                            if any(_clean(p) in clean_cell or clean_cell in _clean(p) for p in patterns):
+                            clean_cell = _clean_header_text(cell_text)
+                            if any(p in clean_cell or clean_cell in p for p in self._nousei_clean_patterns[col_name]):
                                 tentative[col_name] = i
                                 break
                         except Exception:
@@ -595,10 +752,11 @@ class PDFParser:
 
         return col_indices
 
-    def _detect_project_area_from_header(self, header_row: List) -> Optional[str]:
+    def _detect_project_area_from_header(self, header_row: List, header_text: Optional[str] = None) -> Optional[str]:
         """Rudimentary detection of project area based on distinctive headers."""
         try:
-            header_text = "|".join([str(c) for c in header_row if c])
+            if header_text is None:
+                header_text = _join_header_cells(header_row)
             # Kitakami headers often include 明細単価番号 and compact 費 目 ・ 工 種 ・ 種 別 ・ 細
             if any(p in header_text for p in self.kitakami_column_patterns.get("明細単価番号", [])) or \
                any(p in header_text for p in self.kitakami_column_patterns.get("費目・工種・種別・細", [])):
@@ -627,14 +785,7 @@ class PDFParser:
             return self._extract_kitakami_quantity(cell_value)
 
         # Standard Iwate extraction logic
-        value_str = str(cell_value).replace(",", "")
-        number_match = re.search(r'[\d.]+', value_str)
-        if number_match:
-            try:
-                return float(number_match.group())
-            except ValueError:
-                pass
-        return 0.0
+        return _parse_quantity(str(cell_value))
 
     def _extract_kitakami_quantity(self, cell_value, row: List = None, qty_idx: int = None) -> float:
         """
@@ -660,7 +811,7 @@ class PDFParser:
                 return quantity
 
             # Look for decimal patterns in the cell
-            decimal_match = re.search(r'(\d+)\.(\d+)', qty_text)
+            decimal_match = _DECIMAL_RE.search(qty_text)
             if decimal_match:
                 try:
                     return float(decimal_match.group(0))
@@ -668,7 +819,7 @@ class PDFParser:
                     pass
 
         except Exception as e:
-            logger.warning(f"Error extracting Kitakami quantity: {str(e)}")
+            logger.warning("Error extracting Kitakami quantity: %s", e)
 
         return 0.0
 
@@ -691,23 +842,23 @@ class PDFParser:
                         continue
 
                     # Look for decimal patterns starting with "0."
-                    decimal_match = re.search(r'0\.(\d+)', cell_text)
+                    decimal_match = _ZERO_DECIMAL_RE.search(cell_text)
                     if decimal_match:
                         return decimal_match.group(1)
 
                     # Look for decimal patterns starting with "."
-                    dot_decimal_match = re.search(r'\.(\d+)', cell_text)
+                    dot_decimal_match = _DOT_DECIMAL_RE.search(cell_text)
                     if dot_decimal_match:
                         return dot_decimal_match.group(1)
 
                     # Look for patterns like "5", "06", "006" that could be decimal parts
-                    if re.match(r'^\d+$', cell_text):
+                    if _DIGITS_RE.match(cell_text):
                         # If it's a small number, it might be a decimal part
                         if len(cell_text) <= 3:  # 0.5, 0.06, 0.006
                             return cell_text
 
         except Exception as e:
-            logger.warning(f"Error finding adjacent decimal part: {str(e)}")
+            logger.warning("Error finding adjacent decimal part: %s", e)
 
         return None
 
@@ -719,30 +870,15 @@ class PDFParser:
         if not text:
             return False
 
-        # Check for patterns that indicate this is description text
-        description_patterns = [
-            r'[A-Za-z]',  # Contains letters
-            r'[=]',       # Contains equals sign (like L=12.46m)
-            r'[()]',      # Contains parentheses (like (40t))
-            r'[kN]',      # Contains units like kN
-            r'[m]',       # Contains units like m
-            r'[t]',       # Contains units like t
-            r'[号]',      # Contains Japanese characters
-            r'[明]',      # Contains Japanese characters
-        ]
-
-        for pattern in description_patterns:
-            if re.search(pattern, text):
-                return True
-
-        return False
+        # Letters, equals sign (L=12.46m), parentheses ((40t)), units or 号/明
+        return _DESCRIPTION_RE.search(text) is not None
 
     def _normalize_text(self, text: str) -> str:
         """Normalize text by removing spaces and handling full-width/half-width."""
         if not text:
             return ""
         # Remove all spaces and normalize
-        return re.sub(r'\s+', '', str(text))
+        return _WHITESPACE_RE.sub('', str(text))
 
     def _extract_number_from_text(self, text: str) -> Optional[float]:
         """Extract number from text."""
@@ -750,7 +886,7 @@ class PDFParser:
             return None
 
         # Look for decimal numbers
-        decimal_match = re.search(r'(\d+\.?\d*)', text)
+        decimal_match = _NUMBER_RE.search(text)
         if decimal_match:
             try:
                 return float(decimal_match.group(1))
@@ -778,54 +914,63 @@ class PDFParser:
             try:
                 return self._extract_nousei_subtables(pdf_path, start_page, end_page)
             except Exception as e:
-                logger.error(f"Nousei subtable extraction failed: {e}")
+                logger.error("Nousei subtable extraction failed: %s", e)
                 return []
 
         logger.info("=== USING NEW API-READY PDF SUBTABLE EXTRACTOR ===")
-        logger.info(f"PDF file: {pdf_path}")
-        logger.info(f"Page range: {start_page} to {end_page}")
+        logger.info("PDF file: %s", pdf_path)
+        logger.info("Page range: %s to %s", start_page, end_page)
 
         all_subtable_items = []
 
         try:
             # Determine page range
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
+            total_pages = self._page_counts.get(pdf_path)
+            if total_pages is None:
+                with pdfplumber.open(pdf_path) as pdf:
+                    total_pages = len(pdf.pages)
+                self._page_counts[pdf_path] = total_pages
 
-                # Default to full range if not specified
-                actual_start = start_page if start_page is not None else 1
-                actual_end = end_page if end_page is not None else total_pages
+            # Default to full range if not specified
+            actual_start = start_page if start_page is not None else 1
+            actual_end = end_page if end_page is not None else total_pages
 
-                # Validate page range
-                actual_start = max(1, actual_start)
-                actual_end = min(total_pages, actual_end)
+            # Validate page range
+            actual_start = max(1, actual_start)
+            actual_end = min(total_pages, actual_end)
 
-                logger.info(
-                    f"Processing pages {actual_start} to {actual_end} of {total_pages} total pages")
+            logger.info(
+                "Processing pages %d to %d of %d total pages", actual_start, actual_end, total_pages)
 
             # Use the new API-ready subtable extractor
-            extractor = SubtablePDFExtractor()
+            # Share detected tables with the main-table pass (same default table settings)
+            extractor = SubtablePDFExtractor(tables_cache=self._tables_cache)
             result = extractor.extract_subtables_from_pdf(
                 pdf_path, actual_start, actual_end)
 
             if "error" in result:
                 logger.error(
-                    f"New subtable extractor failed: {result['error']}")
+                    "New subtable extractor failed: %s", result['error'])
                 return []
 
             logger.info(
-                f"NEW API extracted {result['total_subtables']} subtables with {result['total_rows']} total rows")
+                "NEW API extracted %d subtables with %d total rows", result['total_subtables'], result['total_rows'])
 
             # Convert the new API response to SubtableItem format
             for subtable in result.get("subtables", []):
                 reference_number = subtable.get("reference_number", "")
                 page_number = subtable.get("page_number", 0)
+                table_title = subtable.get("table_title", None)
                 rows = subtable.get("rows", [])
 
                 for row in rows:
                     try:
                         # Extract data from the new format
                         item_name = row.get("名称・規格", "").strip()
+                        # Only rows with an item name become SubtableItems; skip the rest
+                        # before building their fields
+                        if not item_name:
+                            continue
                         unit = row.get("単位", "").strip()
                         quantity_str = row.get("数量", "").strip()
                         remarks = row.get("摘要", "").strip()
@@ -833,8 +978,7 @@ class PDFParser:
                         # Parse quantity
                         try:
                             # Handle various number formats and commas
-                            quantity = float(quantity_str.replace(
-                                ',', '').replace('，', '')) if quantity_str else 0.0
+                            quantity = float(quantity_str.translate(_THOUSANDS_SEP_TABLE)) if quantity_str else 0.0
                         except (ValueError, TypeError):
                             quantity = 0.0
 
@@ -855,35 +999,30 @@ class PDFParser:
                         except Exception:
                             pass
 
-                        # Create SubtableItem only if we have a valid item name
-                        if item_name:
-                            # Get table title from the subtable
-                            table_title = subtable.get("table_title", None)
-
-                            subtable_item = SubtableItem(
-                                item_key=item_name,
-                                raw_fields=raw_fields,
-                                quantity=quantity,
-                                unit=unit or None,
-                                source="PDF",
-                                page_number=page_number,
-                                reference_number=reference_number,
-                                sheet_name=None,  # PDF doesn't have sheet names
-                                table_title=table_title
-                            )
-                            all_subtable_items.append(subtable_item)
+                        subtable_item = SubtableItem(
+                            item_key=item_name,
+                            raw_fields=raw_fields,
+                            quantity=quantity,
+                            unit=unit or None,
+                            source="PDF",
+                            page_number=page_number,
+                            reference_number=reference_number,
+                            sheet_name=None,  # PDF doesn't have sheet names
+                            table_title=table_title
+                        )
+                        all_subtable_items.append(subtable_item)
 
                     except Exception as e:
                         logger.error(
-                            f"Error converting subtable row to SubtableItem: {e}")
-                        logger.error(f"Row data: {row}")
+                            "Error converting subtable row to SubtableItem: %s", e)
+                        logger.error("Row data: %s", row)
                         continue
 
             logger.info(
-                f"Successfully converted {len(all_subtable_items)} subtable items using NEW API")
+                "Successfully converted %d subtable items using NEW API", len(all_subtable_items))
 
         except Exception as e:
-            logger.error(f"Error using new API subtable extractor: {e}")
+            logger.error("Error using new API subtable extractor: %s", e)
             logger.error(
                 "NEW subtable extraction failed - returning empty list")
             return []
@@ -893,18 +1032,16 @@ class PDFParser:
     def _extract_nousei_subtables(self, pdf_path: str, start_page: Optional[int], end_page: Optional[int]) -> List[SubtableItem]:
         items: List[SubtableItem] = []
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                total = len(pdf.pages)
-                s = 0 if start_page is None else max(0, start_page - 1)
-                e = (total - 1) if end_page is None else min(total - 1, end_page - 1)
+            with pdfplumber.open(pdf_path, pages=_requested_page_numbers(start_page, end_page)) as pdf:
                 # Continuous block numbering across entire page range
                 block_index = 0
                 # Persist block state across page boundaries as well
                 in_block = False
                 current_reference = None
                 pending_reference_index = None
-                for p in range(s, e + 1):
-                    tables = pdf.pages[p].extract_tables() or []
+                for page in _pages_from(pdf, start_page):
+                    p = page.page_number - 1
+                    tables = self._get_tables(page, pdf_path, p) or []
                     # Persist block state across tables within the same page (already persisted across pages)
                     for table in tables:
                         if not table or len(table) < 2:
@@ -951,7 +1088,7 @@ class PDFParser:
                                 continue
                             # End current subtable when encountering a completely empty row
                             try:
-                                if not any((c and str(c).strip()) for c in row):
+                                if self._is_completely_empty_row(row):
                                     in_block = False
                                     current_reference = None
                                     pending_reference_index = None
@@ -968,17 +1105,11 @@ class PDFParser:
 
                             def looks_like_unit(text: str) -> bool:
                                 t = (text or "").strip()
-                                return t in [
-                                    "m3", "m2", "m", "㎥", "㎡", "ｍ", "mm", "㎜", "cm", "㎝",
-                                    "枚", "箇所", "kg", "本", "人", "日", "ha", "掛㎡", "孔", "ton", "式", "基", "台",
-                                    "Ｌ", "L", "台･日", "台・日"
-                                ]
+                                return t in _NOUSEI_UNITS
 
                             def looks_like_quantity(text: str) -> bool:
-                                import re as _re2
-                                t = (text or "").replace(
-                                    ',', '').replace('，', '').strip()
-                                return bool(_re2.match(r"^\d+(?:\.\d+)?$", t))
+                                t = (text or "").translate(_THOUSANDS_SEP_TABLE).strip()
+                                return bool(_PLAIN_NUMBER_RE.match(t))
 
                             cells = [_text(c) for c in row]
                             # Name: first non-empty cell
@@ -1014,7 +1145,7 @@ class PDFParser:
                                 if looks_like_quantity(c):
                                     try:
                                         qty = float(
-                                            c.replace(',', '').replace('，', ''))
+                                            c.translate(_THOUSANDS_SEP_TABLE))
                                     except Exception:
                                         qty = 0.0
                                     break
@@ -1038,5 +1169,5 @@ class PDFParser:
                             items.append(SubtableItem(item_key=item_key_value, raw_fields=raw, quantity=qty, unit=unit, source="PDF",
                                          page_number=p+1, reference_number=reference, sheet_name=None, table_title=None))
         except Exception as e:
-            logger.error(f"Error extracting Nousei subtables: {e}")
+            logger.error("Error extracting Nousei subtables: %s", e)
         return items
@@ -2,17 +2,76 @@ import pdfplumber
 import re
 import json
 import logging
-from typing import List, Dict, Optional, Tuple, Any
+import unicodedata
+from functools import lru_cache
+from typing import List, Dict, Iterator, Optional, Tuple, Any
 from table_title_extractor import extract_pdf_table_title_items
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Column header labels; a row containing any of them is a header row, and
+# cells equal to one are never taken as an item name
+_SUBTABLE_HEADER_LABELS = ("名称・規格", "単位", "数量", "摘要")
+_SUBTABLE_HEADER_LABEL_SET = frozenset(_SUBTABLE_HEADER_LABELS)
+
+# Deletion table for header matching: every Unicode whitespace character
+# (all of them are <= U+3000) plus the full-width middle dot
+_HEADER_NOISE_TABLE = dict.fromkeys(
+    [c for c in range(0x3001) if chr(c).isspace()] + [ord("・")])
+
+# Full-width to ASCII digits for reference numbers
+_FULLWIDTH_DIGITS = str.maketrans('０１２３４５６７８９', '0123456789')
+# Half- and full-width thousands separators, deleted before reading numbers
+_THOUSANDS_SEP_TABLE = str.maketrans("", "", ",，")
+
+
+# Whitespace and thousand separators removed by _normalize_simple_text
+_SPACE_AND_COMMA_RE = re.compile(r"[\s\u3000,，]+")
+
+# Reference numbers in page text: Kitakami 第<digits>号<Kanji> and standard <Kanji><digits>号
+_KITAKAMI_REF_RE = re.compile(r'第\s*([0-9０-９]+)\s*号\s*([一-龯])')
+_STANDARD_REF_RE = re.compile(r'([一-龯々]+)\s*([0-9０-９]+)\s*号')
+# A found reference that is entirely Kitakami style
+_KITAKAMI_REF_ONLY_RE = re.compile(r"^第\s*([0-9０-９]+)\s*号\s*([一-龯])$")
+# Parts of a normalized reference, used to build its space-tolerant row pattern
+_STANDARD_REF_PARTS_RE = re.compile(r'([一-龯々]+)(\d+)号')
+_KITAKAMI_REF_PARTS_RE = re.compile(r'第(\d+)号([一-龯])')
+
+# References whose multi-row extraction is traced at DEBUG level
+_DEBUG_SUBTABLES = frozenset(('単14号', '単30号', '単40号', '内6号', '内9号'))
+
+# Quantity fragments: letters, kanji or unit marks mean a description, not a number
+_DESCRIPTION_RE = re.compile(r"[A-Za-z一-龯号mktN明]")
+_ZERO_DECIMAL_RE = re.compile(r"^0\.(\d+)$")
+_DOT_DECIMAL_RE = re.compile(r"^\.(\d+)$")
+_NEGATIVE_ZERO_DECIMAL_RE = re.compile(r"^-0\.(\d+)$")
+_SHORT_INTEGER_RE = re.compile(r"^-?\d{1,3}$")
+_FIRST_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_simple_text(text: str) -> str:
+    """NFKC-normalize and drop spaces and commas; cached since quantity/unit cells repeat heavily."""
+    try:
+        normalized = unicodedata.normalize('NFKC', text)
+    except Exception:
+        normalized = text
+    # Also strip thousand separators (comma variants) so "1,000" -> "1000"
+    return _SPACE_AND_COMMA_RE.sub("", normalized)
+
+
+def _strip_table_cells(table: List[List[Any]]) -> List[List[str]]:
+    """str(cell).strip() for every cell, with "" for empty cells."""
+    return [[str(cell).strip() if cell else "" for cell in row] for row in table]
+
 
 class SubtablePDFExtractor:
-    def __init__(self):
-        """Initialize the subtable extractor with flexible column patterns."""
+    def __init__(self, tables_cache: Optional[Dict[Tuple[str, int], List[List[List[Any]]]]] = None):
+        """Initialize the subtable extractor with flexible column patterns.
+
+        tables_cache, keyed by (pdf_path, 0-based page index), lets a caller that
+        already ran page.extract_tables() with default settings share the result.
+        """
         # Define flexible patterns for the 4 required columns
         self.column_patterns = {
             # Kitakami header variants are space-tolerant; we normalize before matching
@@ -41,9 +100,27 @@ class SubtablePDFExtractor:
             ]
         }
 
+        # Column patterns with spaces/middle dots removed, for flexible header matching;
+        # spacing variants collapse to one entry (dict.fromkeys keeps the order)
+        self._clean_column_patterns = {
+            col_name: list(dict.fromkeys(p.translate(_HEADER_NOISE_TABLE) for p in patterns))
+            for col_name, patterns in self.column_patterns.items()
+        }
+
         # Global stop flag: set to True when "入力データ一覧表" is encountered
         self.stop_all_extraction = False
 
+        self._tables_cache = tables_cache if tables_cache is not None else {}
+        self._pdf_path: Optional[str] = None
+
+        # Subtables repeat the same header row; memoize its column mapping by cell texts
+        self._column_headers_cache: Dict[Tuple[str, ...], Optional[Dict[str, int]]] = {}
+
+        # Per page reference list: (matchers, any-normalized-reference regex, any-row-pattern regex),
+        # each matcher being (reference, normalized reference, compiled row pattern)
+        self._reference_matcher_cache: Dict[Tuple[str, ...], Tuple[List[Tuple[str, str, Optional[re.Pattern]]],
+                                                                   re.Pattern, Optional[re.Pattern]]] = {}
+
     def extract_subtables_from_pdf(self, pdf_path: str, start_page: int, end_page: int) -> Dict[str, Any]:
         """
         Extract subtables from PDF within specified page range.
@@ -56,8 +133,8 @@ class SubtablePDFExtractor:
         Returns:
             Dict[str, Any]: JSON-like structure containing extracted subtables
         """
-        logger.info(
-            f"Starting subtable extraction from {pdf_path}, pages {start_page}-{end_page}")
+        logger.info("Starting subtable extraction from %s, pages %s-%s",
+                    pdf_path, start_page, end_page)
 
         result = {
             "pdf_file": pdf_path,
@@ -67,23 +144,23 @@ class SubtablePDFExtractor:
             "total_rows": 0
         }
 
+        self._pdf_path = pdf_path
         try:
             with pdfplumber.open(pdf_path) as pdf:
                 total_pages = len(pdf.pages)
 
                 # Validate page range
                 if start_page < 1 or end_page > total_pages or start_page > end_page:
-                    logger.error(
-                        f"Invalid page range: {start_page}-{end_page} (PDF has {total_pages} pages)")
+                    logger.error("Invalid page range: %s-%s (PDF has %d pages)",
+                                 start_page, end_page, total_pages)
                     return result
 
                 # Process each page
                 for page_num in range(start_page - 1, end_page):  # Convert to 0-based
-                    logger.info(f"Processing page {page_num + 1}")
+                    logger.info("Processing page %d", page_num + 1)
                     page = pdf.pages[page_num]
-                    page_subtables = self._extract_subtables_from_page(
-                        page, page_num + 1)
-                    result["subtables"].extend(page_subtables)
+                    result["subtables"].extend(
+                        self._extract_subtables_from_page(page, page_num + 1))
 
                     # Stop all extraction if global stop marker was encountered
                     if self.stop_all_extraction:
@@ -95,42 +172,40 @@ class SubtablePDFExtractor:
                 result["total_rows"] = sum(len(subtable["rows"])
                                            for subtable in result["subtables"])
 
-                logger.info(
-                    f"Extraction complete: {result['total_subtables']} subtables, {result['total_rows']} total rows")
+                logger.info("Extraction complete: %d subtables, %d total rows",
+                            result["total_subtables"], result["total_rows"])
 
         except Exception as e:
-            logger.error(f"Error during extraction: {e}")
+            logger.error("Error during extraction: %s", e)
             result["error"] = str(e)
 
         return result
 
-    def _extract_subtables_from_page(self, page, page_num: int) -> List[Dict[str, Any]]:
-        """Extract all subtables from a single page."""
-        page_subtables = []
-
+    def _extract_subtables_from_page(self, page, page_num: int) -> Iterator[Dict[str, Any]]:
+        """Extract all subtables from a single page, yielding them table by table."""
         try:
             # Get page text for reference number detection
             page_text = page.extract_text()
             if not page_text:
-                logger.warning(f"No text found on page {page_num}")
-                return page_subtables
+                logger.warning("No text found on page %d", page_num)
+                return
 
             # Find all reference numbers on this page
             reference_numbers = self._find_reference_numbers(page_text)
-            logger.info(
-                f"Found reference numbers on page {page_num}: {reference_numbers}")
+            logger.info("Found reference numbers on page %d: %s",
+                        page_num, reference_numbers)
 
             if not reference_numbers:
-                logger.info(f"No reference patterns found on page {page_num}")
-                return page_subtables
+                logger.info("No reference patterns found on page %d", page_num)
+                return
 
             # Extract tables from page
-            tables = page.extract_tables()
+            tables = self._get_page_tables(page, page_num)
             if not tables:
-                logger.info(f"No tables found on page {page_num}")
-                return page_subtables
+                logger.info("No tables found on page %d", page_num)
+                return
 
-            logger.info(f"Found {len(tables)} tables on page {page_num}")
+            logger.info("Found %d tables on page %d", len(tables), page_num)
 
             # Process each table to find subtables
             for table_idx, table in enumerate(tables):
@@ -142,22 +217,35 @@ class SubtablePDFExtractor:
                     self.stop_all_extraction = True
                     logger.info(
                         "Detected global stop row '入力データ一覧表' within table. Stopping now.")
-                    return page_subtables
+                    return
+
+                # Subtables start at a reference row and every reference contains 号
+                # (no other character NFKC-normalizes to it); skip tables without one
+                if not any(cell and "号" in str(cell) for row in table for cell in row):
+                    continue
 
-                table_subtables = self._extract_subtables_from_table(
-                    table, reference_numbers, page_num, table_idx, page.extract_text()
+                yield from self._extract_subtables_from_table(
+                    table, reference_numbers, page_num, table_idx, page_text
                 )
-                page_subtables.extend(table_subtables)
 
                 if self.stop_all_extraction:
                     logger.info(
                         "Global stop flag set during table processing. Exiting page early.")
-                    return page_subtables
+                    return
 
         except Exception as e:
-            logger.error(f"Error processing page {page_num}: {e}")
-
-        return page_subtables
+            logger.error("Error processing page %d: %s", page_num, e)
+
+    def _get_page_tables(self, page, page_num: int) -> List[List[List[Any]]]:
+        """page.extract_tables() for a 1-based page number, shared through the tables cache."""
+        if self._pdf_path is None:
+            return page.extract_tables()
+        key = (self._pdf_path, page_num - 1)
+        tables = self._tables_cache.get(key)
+        if tables is None:
+            tables = page.extract_tables()
+            self._tables_cache[key] = tables
+        return tables
 
     def _find_reference_numbers(self, text: str) -> List[str]:
         """Find reference numbers in text.
@@ -167,40 +255,33 @@ class SubtablePDFExtractor:
         - Kitakami style: 第<digits>号<Kanji> (e.g., 第12号施)
         Both tolerate arbitrary spaces and full-width digits.
         """
-        if not text:
+        # Both patterns require 号; most pages without references skip the scans
+        if not text or "号" not in text:
             return []
 
         refs: List[str] = []
+        seen = set()  # mirrors refs for O(1) duplicate checks; refs keeps page order
 
         # Kitakami style FIRST: 第 + digits + 号 + one Kanji (prefer the longer, more specific form)
-        kita_pattern = r'第\s*([0-9０-９]+)\s*号\s*([一-龯])'
-        for num, tail in re.findall(kita_pattern, text):
-            try:
-                num_norm = str(num).translate(
-                    str.maketrans('０１２３４５６７８９', '0123456789'))
-            except Exception:
-                num_norm = str(num)
-            value = f"第{num_norm}号{tail}"
-            if value not in refs:
+        for num, tail in _KITAKAMI_REF_RE.findall(text):
+            value = f"第{num.translate(_FULLWIDTH_DIGITS)}号{tail}"
+            if value not in seen:
+                seen.add(value)
                 refs.append(value)
 
         # Standard pattern: Kanji + digits + 号 (avoid overshadowing Kitakami-specific matches)
-        std_pattern = r'([一-龯々]+)\s*([0-9０-９]+)\s*号'
-        for kanji, num in re.findall(std_pattern, text):
-            try:
-                num_norm = str(num).translate(
-                    str.maketrans('０１２３４５６７８９', '0123456789'))
-            except Exception:
-                num_norm = str(num)
-            value = f"{kanji}{num_norm}号"
+        for kanji, num in _STANDARD_REF_RE.findall(text):
+            value = f"{kanji}{num.translate(_FULLWIDTH_DIGITS)}号"
+            if value in seen:
+                continue
             # If this is a bare 第N号 and we already captured 第N号X, skip the shorter one
             if value.startswith("第"):
                 if any(r.startswith(value) and len(r) > len(value) for r in refs):
                     continue
-            if value not in refs:
-                refs.append(value)
+            seen.add(value)
+            refs.append(value)
 
-        logger.debug(f"Extracted reference numbers: {refs}")
+        logger.debug("Extracted reference numbers: %s", refs)
         return refs
 
     def _extract_subtables_from_table(self, table: List[List[str]], reference_numbers: List[str],
@@ -212,31 +293,36 @@ class SubtablePDFExtractor:
         subtables = []
         current_reference = None
         current_subtable_rows = []
+        # Row traces are debug output; decide once per table instead of per row
+        debug_rows = logger.isEnabledFor(logging.DEBUG)
         current_column_mapping = None
         current_is_kitakami = False  # Track if current subtable uses Kitakami-style headers
         current_table_title = None
         processed_rows = set()  # Track processed rows to avoid duplicates
+        stripped_table = None  # Built on first multi-row extraction, shared by later subtables
 
         for row_idx, row in enumerate(table):
             # Skip rows that were already processed as part of multi-row extraction
             if row_idx in processed_rows:
-                logger.info(
-                    f"🎯 DEBUG: Skipping row {row_idx} (already processed): {row}")
+                if debug_rows:
+                    logger.debug(
+                        "🎯 DEBUG: Skipping row %d (already processed): %s", row_idx, row)
                 continue
 
             row_text = ' '.join([str(cell) if cell else '' for cell in row])
 
-            # Debug logging for internal subtable rows
-            if row[0] and ('発生品運搬' in str(row[0]) or '交通誘導警備員' in str(row[0])):
-                logger.info(
-                    f"🎯 DEBUG: Processing internal subtable row {row_idx}: {row}")
+            if debug_rows and row[0]:
+                # Debug logging for internal subtable rows
+                if '発生品運搬' in str(row[0]) or '交通誘導警備員' in str(row[0]):
+                    logger.debug(
+                        "🎯 DEBUG: Processing internal subtable row %d: %s", row_idx, row)
 
-            # Debug logging for key rows
-            if row[0] and ('3745' in str(row[0]) or '合計' in str(row[0])):
-                logger.info(f"🎯 DEBUG: Processing row {row_idx}: {row}")
+                # Debug logging for key rows
+                if '3745' in str(row[0]) or '合計' in str(row[0]):
+                    logger.debug("🎯 DEBUG: Processing row %d: %s", row_idx, row)
 
             # If we encounter the global stop marker anywhere, halt all extraction
-            if self._row_is_global_stop_marker(row):
+            if self._row_is_global_stop_marker(row, row_text):
                 self.stop_all_extraction = True
                 logger.info(
                     "Encountered '入力データ一覧表' row. Halting all subtable extraction.")
@@ -245,10 +331,10 @@ class SubtablePDFExtractor:
             # Process data rows for current subtable FIRST (before checking for references)
             if current_reference:
                 # Check for total row (end of current subtable)
-                if self._is_total_row(row, current_is_kitakami):
+                if self._is_total_row(row, current_is_kitakami, row_text):
                     logger.info(
-                        f"Found total row for {current_reference}, ending current subtable and searching for next reference")
-                    logger.info(f"🎯 DEBUG: Total row content: {row}")
+                        "Found total row for %s, ending current subtable and searching for next reference", current_reference)
+                    logger.debug("🎯 DEBUG: Total row content: %s", row)
                     # Finalize current subtable
                     if current_subtable_rows:
                         subtable = self._create_subtable_dict(
@@ -264,40 +350,46 @@ class SubtablePDFExtractor:
                     continue
 
                 # Skip header row - check if this row contains column headers
-                row_text_check = ' '.join(
-                    [str(cell) if cell else '' for cell in row])
-                is_header_row = any(header in row_text_check for header in [
-                                    '名称・規格', '単位', '数量', '摘要'])
+                # (no label contains a space, so row_text's padding cannot create a match)
+                is_header_row = any(
+                    header in row_text for header in _SUBTABLE_HEADER_LABELS)
                 if is_header_row:
-                    logger.info(
-                        f"🎯 DEBUG: Skipping header row {row_idx}: {row}")
+                    if debug_rows:
+                        logger.debug(
+                            "🎯 DEBUG: Skipping header row %d: %s", row_idx, row)
                     continue
 
                 # Extract row data using multi-row logic (call once per subtable)
                 if current_column_mapping and not current_subtable_rows:
                     # Debug logging for internal subtables and VP40*3745
-                    if row_idx < len(table) and table[row_idx][0]:
+                    if debug_rows and row_idx < len(table) and table[row_idx][0]:
                         row_0_text = str(table[row_idx][0])
                         if '3745' in row_0_text:
-                            logger.info(
-                                f"🎯 DEBUG: About to call multi-row extraction for VP40*3745 from row {row_idx}")
+                            logger.debug(
+                                "🎯 DEBUG: About to call multi-row extraction for VP40*3745 from row %d", row_idx)
                         elif '発生品運搬' in row_0_text or '交通誘導警備員' in row_0_text:
-                            logger.info(
-                                f"🎯 DEBUG: About to call multi-row extraction for internal subtable from row {row_idx}: {row_0_text}")
+                            logger.debug(
+                                "🎯 DEBUG: About to call multi-row extraction for internal subtable from row %d: %s",
+                                row_idx, row_0_text)
 
                     # Call multi-row extraction once from the first data row
+                    if stripped_table is None:
+                        stripped_table = _strip_table_cells(table)
                     extracted_rows, processed_indices = self._extract_multirow_data(
-                        table, row_idx, current_column_mapping, current_reference, current_is_kitakami)
+                        table, row_idx, current_column_mapping, current_reference, current_is_kitakami,
+                        stripped_table)
                     # Add all extracted logical rows
                     for row_data in extracted_rows:
                         if row_data and any(row_data.values()):
                             # Debug logging for result
-                            if '3745' in row_data.get('名称・規格', ''):
-                                logger.info(
-                                    f"🎯 DEBUG: VP40*3745 row data result: {row_data}")
-                            elif '発生品運搬' in row_data.get('名称・規格', '') or '交通誘導警備員' in row_data.get('名称・規格', ''):
-                                logger.info(
-                                    f"🎯 DEBUG: Internal subtable row data result: {row_data}")
+                            if debug_rows:
+                                item_text = row_data.get('名称・規格', '')
+                                if '3745' in item_text:
+                                    logger.debug(
+                                        "🎯 DEBUG: VP40*3745 row data result: %s", row_data)
+                                elif '発生品運搬' in item_text or '交通誘導警備員' in item_text:
+                                    logger.debug(
+                                        "🎯 DEBUG: Internal subtable row data result: %s", row_data)
                             current_subtable_rows.append(row_data)
                     # Update processed_rows
                     processed_rows.update(processed_indices)
@@ -309,7 +401,7 @@ class SubtablePDFExtractor:
 
             if found_reference:
                 logger.info(
-                    f"Found reference {found_reference} at row {row_idx + 1}")
+                    "Found reference %s at row %d", found_reference, row_idx + 1)
 
                 # If we have an existing subtable, save it first
                 if current_reference and current_subtable_rows:
@@ -333,7 +425,7 @@ class SubtablePDFExtractor:
                             column_mapping = potential_headers
                             header_row_idx = check_idx
                             logger.info(
-                                f"Found column headers for {found_reference}: {column_mapping}")
+                                "Found column headers for %s: %s", found_reference, column_mapping)
                             break
 
                 # Only treat as subtable header if we found valid column headers
@@ -345,7 +437,7 @@ class SubtablePDFExtractor:
                     kitakami_ref = False
                     try:
                         kitakami_ref = bool(
-                            re.match(r"^第\s*([0-9０-９]+)\s*号\s*([一-龯])$", str(found_reference or "")))
+                            _KITAKAMI_REF_ONLY_RE.match(str(found_reference or "")))
                     except Exception:
                         kitakami_ref = False
                     current_is_kitakami = ('明細単価番号' in (
@@ -358,14 +450,14 @@ class SubtablePDFExtractor:
                     if table_title:
                         current_table_title = table_title
                         logger.info(
-                            f"Extracted table title for {found_reference}: {table_title}")
+                            "Extracted table title for %s: %s", found_reference, table_title)
 
                     # Skip to after the header row for data extraction
                     continue
                 else:
                     # This is just a reference number in the data, not a subtable header
                     logger.info(
-                        f"Reference {found_reference} found in data content, not treating as subtable header")
+                        "Reference %s found in data content, not treating as subtable header", found_reference)
                     continue
 
         # Don't forget the last subtable if no total row was found
@@ -382,12 +474,43 @@ class SubtablePDFExtractor:
 
         Matches both standard and Kitakami styles, tolerating spaces/width differences.
         """
-        if not row_text:
+        # Every reference ends in or contains 号, and no other character
+        # NFKC-normalizes to it, so rows without 号 cannot match
+        if not row_text or "号" not in row_text:
             return None
 
         # Normalized containment check as a robust fallback
         norm_row = self._normalize_simple(row_text)
 
+        matchers, any_norm_ref, any_pattern = self._reference_matchers(
+            reference_numbers)
+        # One scan per text decides whether any reference can match; the
+        # ordered loop below then only runs for rows that hold one
+        if not any_norm_ref.search(norm_row) and (any_pattern is None or not any_pattern.search(row_text)):
+            return None
+
+        for ref_num, norm_ref, pattern in matchers:
+            # 1) Exact normalized containment
+            if norm_ref in norm_row:
+                return ref_num
+
+            # 2) Space-tolerant standard / Kitakami style regex
+            if pattern is not None and pattern.search(row_text):
+                return ref_num
+
+        return None
+
+    def _reference_matchers(self, reference_numbers: List[str]) -> Tuple[List[Tuple[str, str, Optional[re.Pattern]]], re.Pattern, Optional[re.Pattern]]:
+        """Sorted references with their normalized form and compiled row pattern, built once per list.
+
+        Also returns two alternations over all references (normalized forms, row
+        patterns) that match a row iff at least one reference does.
+        """
+        key = tuple(reference_numbers)
+        cached = self._reference_matcher_cache.get(key)
+        if cached is not None:
+            return cached
+
         # Prefer longer references first (e.g., 第12号施 over 第12号)
         try:
             sorted_refs = sorted(reference_numbers, key=lambda r: len(
@@ -395,30 +518,48 @@ class SubtablePDFExtractor:
         except Exception:
             sorted_refs = reference_numbers
 
+        matchers = []
         for ref_num in sorted_refs:
-            # 1) Exact normalized containment
-            if self._normalize_simple(ref_num) in norm_row:
-                return ref_num
-
-            # 2) Standard style regex (Kanji + digits + 号) with spaces
-            m_std = re.match(r'([一-龯々]+)(\d+)号', ref_num)
+            patterns = []
+            # Standard style regex (Kanji + digits + 号) with spaces
+            m_std = _STANDARD_REF_PARTS_RE.match(ref_num)
             if m_std:
                 kanji_part, number_part = m_std.group(1), m_std.group(2)
-                pattern = f"{kanji_part}\\s*{number_part}\\s*号"
-                if re.search(pattern, row_text):
-                    return ref_num
+                patterns.append(f"{kanji_part}\\s*{number_part}\\s*号")
 
-            # 3) Kitakami style: 第 + digits + 号 + one Kanji
-            m_kita = re.match(r'第(\d+)号([一-龯])', ref_num)
+            # Kitakami style: 第 + digits + 号 + one Kanji
+            m_kita = _KITAKAMI_REF_PARTS_RE.match(ref_num)
             if m_kita:
                 num, tail = m_kita.group(1), m_kita.group(2)
-                pattern = f"第\\s*{num}\\s*号\\s*{tail}"
-                if re.search(pattern, row_text):
-                    return ref_num
+                patterns.append(f"第\\s*{num}\\s*号\\s*{tail}")
 
-        return None
+            # Both styles in one alternation so each row is searched once per reference
+            pattern = re.compile("|".join(patterns)) if patterns else None
+            matchers.append(
+                (ref_num, self._normalize_simple(ref_num), pattern))
+
+        any_norm_ref = re.compile(
+            "|".join(re.escape(norm_ref) for _, norm_ref, _ in matchers))
+        row_patterns = [p.pattern for _, _, p in matchers if p is not None]
+        any_pattern = re.compile(
+            "|".join(row_patterns)) if row_patterns else None
+
+        cached = (matchers, any_norm_ref, any_pattern)
+        self._reference_matcher_cache[key] = cached
+        return cached
 
     def _find_column_headers(self, row: List[str]) -> Optional[Dict[str, int]]:
+        """Find column header positions in a row (cached per distinct row)."""
+        key = tuple(str(cell) if cell else "" for cell in row)
+        if key in self._column_headers_cache:
+            column_mapping = self._column_headers_cache[key]
+        else:
+            column_mapping = self._compute_column_headers(row)
+            self._column_headers_cache[key] = column_mapping
+        # Callers keep the mapping per subtable; hand out a copy
+        return dict(column_mapping) if column_mapping is not None else None
+
+    def _compute_column_headers(self, row: List[str]) -> Optional[Dict[str, int]]:
         """Find column header positions in a row."""
         column_mapping = {}
 
@@ -426,63 +567,65 @@ class SubtablePDFExtractor:
             if not cell:
                 continue
 
-            cell_text = str(cell).strip()
-
-            # Check this cell against each column pattern
-            matched = False
-            for col_name, patterns in self.column_patterns.items():
-                if matched or col_name in column_mapping:
-                    continue  # Skip if we already matched this cell or found this column
+            # Flexible matching with spaces and middle dots removed; an exact
+            # pattern match is always a flexible match as well
+            clean_cell = str(cell).translate(_HEADER_NOISE_TABLE)
 
-                for pattern in patterns:
-                    # First try exact match
-                    if pattern == cell_text:
-                        column_mapping[col_name] = col_idx
-                        matched = True
-                        break
-
-                    # Then try flexible matching - remove spaces and special characters
-                    clean_cell = re.sub(r'[\s　・]', '', cell_text)
-                    clean_pattern = re.sub(r'[\s　・]', '', pattern)
-
-                    if clean_pattern in clean_cell or clean_cell in clean_pattern:
-                        column_mapping[col_name] = col_idx
-                        matched = True
-                        break
-
-                if matched:
+            # Assign the cell to the first column (not yet found) with a matching pattern
+            for col_name, clean_patterns in self._clean_column_patterns.items():
+                if col_name in column_mapping:
+                    continue
+                if any(p in clean_cell or clean_cell in p for p in clean_patterns):
+                    column_mapping[col_name] = col_idx
                     break
 
-        logger.info(f"Column mapping result: {column_mapping}")
+            # Every column is placed; the remaining cells cannot change the mapping
+            if len(column_mapping) == len(self._clean_column_patterns):
+                break
+
+        logger.info("Column mapping result: %s", column_mapping)
 
         # Return mapping only if we found at least 2 of the 4 required columns
         if len(column_mapping) >= 2:
             logger.info(
-                f"✓ Found valid column mapping with {len(column_mapping)} columns")
+                "✓ Found valid column mapping with %d columns", len(column_mapping))
             return column_mapping
         else:
             logger.info(
-                f"✗ Not enough columns found ({len(column_mapping)}/2 minimum required)")
+                "✗ Not enough columns found (%d/2 minimum required)", len(column_mapping))
 
         return None
 
-    def _is_total_row(self, row: List[str], is_kitakami: bool = False) -> bool:
+    def _is_total_row(self, row: List[str], is_kitakami: bool = False, row_text: Optional[str] = None) -> bool:
         """Return True if this row represents the total separator for the current subtable.
 
         - For all areas: rows containing '合計' anywhere end the subtable.
         - For Kitakami only: an exact '計' row (ignoring spaces/width) ends the subtable.
         """
-        row_text = " ".join([str(cell) if cell else "" for cell in row])
-        norm = self._normalize_simple(row_text)
+        if row_text is None:
+            row_text = " ".join([str(cell) if cell else "" for cell in row])
         if "合計" in row_text:
             return True
-        if is_kitakami and norm == "計":
+        # 計 is the only character that NFKC-normalizes to 計, so test it before normalizing
+        if is_kitakami and "計" in row_text and self._normalize_simple(row_text) == "計":
             return True
         return False
 
-    def _row_is_global_stop_marker(self, row: List[str]) -> bool:
+    def _is_total_cell(self, cell_text: str, is_kitakami: bool = False) -> bool:
+        """Cell-level counterpart of _is_total_row for the first cell of a (stripped) row."""
+        if not cell_text:
+            return False
+        if "合計" in cell_text:
+            return True
+        return is_kitakami and "計" in cell_text and self._normalize_simple(cell_text) == "計"
+
+    def _row_is_global_stop_marker(self, row: List[str], row_text: Optional[str] = None) -> bool:
         """Return True if row text equals '入力データ一覧表' ignoring width/spaces."""
-        row_text = " ".join([str(cell) if cell else "" for cell in row])
+        if row_text is None:
+            row_text = " ".join([str(cell) if cell else "" for cell in row])
+        # 覧 has no compatibility variants, so rows without it cannot match after NFKC
+        if "覧" not in row_text:
+            return False
         norm = self._normalize_simple(row_text)
         return "入力データ一覧表" in norm
 
@@ -511,44 +654,58 @@ class SubtablePDFExtractor:
 
     def _extract_multirow_data(self, table: List[List[str]], start_row_idx: int,
                                column_mapping: Dict[str, int], reference_number: str,
-                               kitakami_mode: bool = False) -> Tuple[List[Dict[str, str]], List[int]]:
+                               kitakami_mode: bool = False,
+                               stripped_table: Optional[List[List[str]]] = None) -> Tuple[List[Dict[str, str]], List[int]]:
         """Extract data that may span multiple rows, creating separate logical rows for each item.
+        stripped_table holds str(cell).strip() per cell ("" for empty) and is built here if not given.
         Returns: (list_of_extracted_rows, list_of_processed_row_indices)
         """
         if start_row_idx >= len(table):
             return [], []
 
+        # The lookahead revisits each row up to five times; stringify/strip each cell once
+        if stripped_table is None:
+            stripped_table = _strip_table_cells(table)
+
         extracted_rows = []
         processed_indices = []
 
         # Debug flags
-        debug_subtables = ['単14号', '単30号', '単40号', '内6号', '内9号']
-        is_debug = reference_number in debug_subtables
+        is_debug = reference_number in _DEBUG_SUBTABLES and logger.isEnabledFor(
+            logging.DEBUG)
 
         if is_debug:
-            logger.info(
-                f"🎯 DEBUG: Starting multi-row extraction for {reference_number} at row {start_row_idx}")
+            logger.debug(
+                "🎯 DEBUG: Starting multi-row extraction for %s at row %d", reference_number, start_row_idx)
+
+        # Column lookups that are the same for every row of this subtable
+        item_name_idx = column_mapping.get('名称・規格', 0)
+        name_col_idx = column_mapping.get('名称・規格', -1)
+        same_row_cols = [(col_name, col_idx) for col_name, col_idx in column_mapping.items()
+                         if col_name != '名称・規格']
+        lookahead_cols = [(col_name, column_mapping[col_name])
+                          for col_name in ['単位', '数量', '摘要', '明細単価番号']
+                          if col_name in column_mapping]
 
         # Process the table starting from start_row_idx
         current_idx = start_row_idx
 
         while current_idx < len(table):
             current_row = table[current_idx]
+            current_cells = stripped_table[current_idx]
 
             # Stop if we encounter a 合計 (total) row
-            if current_row[0] and ('合計' in str(current_row[0]) or (kitakami_mode and self._normalize_simple(str(current_row[0])) == '計')):
+            if self._is_total_cell(current_cells[0], kitakami_mode):
                 if is_debug:
-                    logger.info(f"🎯 DEBUG: Stopping at 合計 row {current_idx}")
+                    logger.debug("🎯 DEBUG: Stopping at 合計 row %d", current_idx)
                 break
 
             # Check if this row has an item name (名称・規格)
             item_name = ""
-            if (column_mapping.get('名称・規格', 0) < len(current_row) and
-                    current_row[column_mapping.get('名称・規格', 0)]):
-                potential_item = str(
-                    current_row[column_mapping.get('名称・規格', 0)]).strip()
+            if item_name_idx < len(current_row) and current_row[item_name_idx]:
+                potential_item = current_cells[item_name_idx]
                 # Skip header values
-                if potential_item and potential_item not in ["名称・規格", "単位", "数量", "摘要"]:
+                if potential_item and potential_item not in _SUBTABLE_HEADER_LABEL_SET:
                     item_name = potential_item
 
             if item_name:
@@ -562,25 +719,25 @@ class SubtablePDFExtractor:
                 }
 
                 if is_debug:
-                    logger.info(
-                        f"🎯 DEBUG: Found item '{item_name}' at row {current_idx}")
+                    logger.debug(
+                        "🎯 DEBUG: Found item '%s' at row %d", item_name, current_idx)
 
                 # Look ahead up to 4 rows to find unit/quantity for THIS specific item
                 item_processed_indices = [current_idx]
 
                 # First, check the current row for any additional data
-                for col_name, col_idx in column_mapping.items():
-                    if col_name != '名称・規格' and col_idx < len(current_row) and current_row[col_idx]:
+                for col_name, col_idx in same_row_cols:
+                    if col_idx < len(current_row) and current_row[col_idx]:
                         if col_name == '数量':
                             cell_value = self._merge_quantity_with_adjacent(
-                                current_row, col_idx) or str(current_row[col_idx]).strip()
+                                current_row, col_idx) or current_cells[col_idx]
                         else:
-                            cell_value = str(current_row[col_idx]).strip()
-                        if cell_value and cell_value not in ["名称・規格", "単位", "数量", "摘要"]:
+                            cell_value = current_cells[col_idx]
+                        if cell_value and cell_value not in _SUBTABLE_HEADER_LABEL_SET:
                             row_data[col_name] = cell_value
                             if is_debug:
-                                logger.info(
-                                    f"🎯 DEBUG: Found {col_name} = '{cell_value}' in same row")
+                                logger.debug(
+                                    "🎯 DEBUG: Found %s = '%s' in same row", col_name, cell_value)
 
                 # Look ahead up to 4 rows for missing unit/quantity
                 for lookahead in range(1, 5):  # Look ahead 1-4 rows
@@ -589,47 +746,43 @@ class SubtablePDFExtractor:
                         break
 
                     lookahead_row = table[lookahead_idx]
+                    lookahead_cells = stripped_table[lookahead_idx]
 
                     # Stop if we hit another item name or 合計
                     # Use the mapped '名称・規格' column (not just column 0) to detect new items
                     next_item_name = ""
-                    name_col_idx = column_mapping.get('名称・規格', -1)
                     if name_col_idx != -1 and name_col_idx < len(lookahead_row) and lookahead_row[name_col_idx]:
-                        candidate = str(lookahead_row[name_col_idx]).strip()
-                        if candidate and candidate not in ["名称・規格", "単位", "数量", "摘要"]:
+                        candidate = lookahead_cells[name_col_idx]
+                        if candidate and candidate not in _SUBTABLE_HEADER_LABEL_SET:
                             next_item_name = candidate
 
-                    first_cell_text = str(lookahead_row[0]).strip(
-                    ) if lookahead_row and lookahead_row[0] else ""
+                    first_cell_text = lookahead_cells[0] if lookahead_cells else ""
 
-                    if ('合計' in first_cell_text or
-                        (kitakami_mode and self._normalize_simple(first_cell_text) == '計') or
+                    if (self._is_total_cell(first_cell_text, kitakami_mode) or
                             (next_item_name and next_item_name != item_name)):
                         if is_debug:
                             stop_reason = next_item_name if next_item_name else first_cell_text
-                            logger.info(
-                                f"🎯 DEBUG: Stopping lookahead at row {lookahead_idx}: '{stop_reason}'")
+                            logger.debug(
+                                "🎯 DEBUG: Stopping lookahead at row %d: '%s'", lookahead_idx, stop_reason)
                         break
 
                     # Look for missing unit/quantity/remarks/code in this lookahead row
                     found_data = False
-                    for col_name in ['単位', '数量', '摘要', '明細単価番号']:
-                        col_idx = column_mapping.get(col_name, -1)
-                        if (col_idx != -1 and col_idx < len(lookahead_row) and
+                    for col_name, col_idx in lookahead_cols:
+                        if (col_idx < len(lookahead_row) and
                                 lookahead_row[col_idx] and not row_data.get(col_name)):
                             if col_name == '数量':
                                 cell_value = self._merge_quantity_with_adjacent(
-                                    lookahead_row, col_idx) or str(lookahead_row[col_idx]).strip()
+                                    lookahead_row, col_idx) or lookahead_cells[col_idx]
                             else:
-                                cell_value = str(
-                                    lookahead_row[col_idx]).strip()
-                            if cell_value and cell_value not in ["名称・規格", "単位", "数量", "摘要"]:
+                                cell_value = lookahead_cells[col_idx]
+                            if cell_value and cell_value not in _SUBTABLE_HEADER_LABEL_SET:
                                 row_data[col_name] = cell_value
                                 item_processed_indices.append(lookahead_idx)
                                 found_data = True
                                 if is_debug:
-                                    logger.info(
-                                        f"🎯 DEBUG: Found {col_name} = '{cell_value}' at lookahead row {lookahead_idx}")
+                                    logger.debug(
+                                        "🎯 DEBUG: Found %s = '%s' at lookahead row %d", col_name, cell_value, lookahead_idx)
 
                     # If we found some data, we can continue looking for more
 
@@ -646,8 +799,9 @@ class SubtablePDFExtractor:
                 processed_indices.extend(item_processed_indices)
 
                 if is_debug:
-                    logger.info(
-                        f"🎯 DEBUG: Completed logical row: 名称='{row_data['名称・規格']}', 単位='{row_data['単位']}', 数量='{row_data['数量']}', 摘要='{row_data['摘要']}'")
+                    logger.debug(
+                        "🎯 DEBUG: Completed logical row: 名称='%s', 単位='%s', 数量='%s', 摘要='%s'",
+                        row_data['名称・規格'], row_data['単位'], row_data['数量'], row_data['摘要'])
 
                 # Move to the next unprocessed row
                 current_idx = max(
@@ -657,8 +811,8 @@ class SubtablePDFExtractor:
                 current_idx += 1
 
         if is_debug:
-            logger.info(
-                f"🎯 DEBUG: Extracted {len(extracted_rows)} logical rows")
+            logger.debug(
+                "🎯 DEBUG: Extracted %d logical rows", len(extracted_rows))
 
         return extracted_rows, processed_indices
 
@@ -681,13 +835,7 @@ class SubtablePDFExtractor:
 
     def _normalize_simple(self, text: str) -> str:
         """Normalize text using NFKC and remove all spaces (ASCII and full-width)."""
-        try:
-            import unicodedata
-            normalized = unicodedata.normalize('NFKC', text)
-        except Exception:
-            normalized = text
-        # Also strip thousand separators (comma variants) so "1,000" -> "1000"
-        return re.sub(r"[\s\u3000,，]+", "", normalized)
+        return _normalize_simple_text(text)
 
     # --- Kitakami quantity merge helpers ---
     def _merge_quantity_with_adjacent(self, row: List[str], qty_idx: int) -> str:
@@ -734,29 +882,29 @@ class SubtablePDFExtractor:
             if 0 <= check_idx < len(row) and row[check_idx]:
                 t = self._normalize_simple(str(row[check_idx]))
                 # If looks like description with letters/kanji/units, skip
-                if re.search(r"[A-Za-z一-龯号mktN明]", t):
+                if _DESCRIPTION_RE.search(t):
                     continue
                 # .xx or 0.xx (allow optional leading minus)
-                m = re.search(r"^0\.(\d+)$", t)
+                m = _ZERO_DECIMAL_RE.search(t)
                 if m:
                     return (m.group(1), t.startswith('-'))
-                m = re.search(r"^\.(\d+)$", t)
+                m = _DOT_DECIMAL_RE.search(t)
                 if m:
                     return (m.group(1), t.startswith('-'))
                 # -0.xx
-                m = re.search(r"^-0\.(\d+)$", t)
+                m = _NEGATIVE_ZERO_DECIMAL_RE.search(t)
                 if m:
                     return (m.group(1), True)
                 # Pure digits up to 3 chars (allow optional leading '-') → decimal digits
-                if re.match(r"^-?\d{1,3}$", t):
+                if _SHORT_INTEGER_RE.match(t):
                     return (t.lstrip('-'), t.startswith('-'))
         return None
 
     def _extract_first_number(self, text: str) -> Optional[str]:
         # Accept digits with optional thousand separators and optional decimal part
         # Normalize commas before extracting
-        t = text.replace(',', '').replace('，', '') if text else text
-        m = re.search(r"-?\d+(?:\.\d+)?", t)
+        t = text.translate(_THOUSANDS_SEP_TABLE) if text else text
+        m = _FIRST_NUMBER_RE.search(t)
         return m.group(0) if m else None
 
     def _infer_quantity_fallback(self, row: List[str], column_mapping: Dict[str, int], table: List[List[str]], row_idx: int) -> str:
@@ -794,7 +942,7 @@ class SubtablePDFExtractor:
                     continue
                 text = self._normalize_simple(str(cell))
                 # Skip description-like cells
-                if re.search(r"[A-Za-z一-龯号明mktN]", text):
+                if _DESCRIPTION_RE.search(text):
                     continue
                 num = self._extract_first_number(text)
                 if num:
@@ -937,6 +1085,9 @@ def extract_subtables_api(pdf_path: str, start_page: int, end_page: int) -> str:
 
 # Test function to demonstrate usage
 if __name__ == "__main__":
+    # Importers configure logging themselves (see main.py); the script run does it here
+    logging.basicConfig(level=logging.INFO)
+
     # Test with the full specified range
     pdf_path = "../07_入札時（見積）積算参考資料.pdf"
     start_page = 13
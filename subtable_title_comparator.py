@@ -10,8 +10,6 @@ from typing import List, Dict, Optional, Tuple
 from subtable_pdf_extractor import SubtablePDFExtractor
 from excel_subtable_extractor import extract_subtables_from_excel
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -776,6 +774,8 @@ def print_comparison_summary(comparison_result: Dict):
 
 # Test function
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     pdf_file = "07_入札時（見積）積算参考資料.pdf"
     excel_file = "【修正】水沢橋　積算書.xlsx"
 
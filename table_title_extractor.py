@@ -10,8 +10,6 @@ import logging
 from typing import List, Dict, Optional, Tuple
 import pandas as pd
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
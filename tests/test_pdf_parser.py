@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+
+from server.services import pdf_parser
+from server.services.pdf_parser import PDFParser
+
+
+class FakePage:
+    def __init__(self, page_number, tables, chars):
+        self.page_number = page_number
+        self.chars = chars
+        self._tables = tables
+        self.extract_calls = 0
+
+    def extract_tables(self, table_settings=None):
+        self.extract_calls += 1
+        return self._tables
+
+
+class FakePDF:
+    def __init__(self, pages):
+        self.pages = pages
+
+
+def _char_less_block_pages():
+    """A 農政 block split by a scanned page whose only table is an empty ruled grid."""
+    return [
+        FakePage(1, [[
+            ["・・・土工", "", "", ""],
+            ["材料A", "", "m", "3"],
+        ]], chars=[{"text": "土"}]),
+        FakePage(2, [[
+            ["", "", "", ""],
+            ["", "", "", ""],
+        ]], chars=[]),
+        FakePage(3, [[
+            ["材料B", "", "本", "2"],
+            ["材料C", "", "m", "1"],
+        ]], chars=[{"text": "材"}]),
+    ]
+
+
+def test_main_table_skips_page_without_text_layer():
+    page = _char_less_block_pages()[1]
+
+    assert PDFParser()._extract_tables_from_page(page, 1, "岩手", "doc.pdf") == []
+    assert page.extract_calls == 0
+
+
+def test_nousei_block_ends_at_empty_table_on_page_without_text_layer(monkeypatch):
+    pages = _char_less_block_pages()
+
+    @contextmanager
+    def fake_open(pdf_path, **kwargs):
+        yield FakePDF(pages)
+
+    monkeypatch.setattr(pdf_parser.pdfplumber, "open", fake_open)
+
+    parser = PDFParser()
+    # The main-table pass runs first and must not leave an empty cached result behind
+    for page in pages:
+        parser._extract_tables_from_page(page, page.page_number - 1, "農政", "doc.pdf")
+    items = parser._extract_nousei_subtables("doc.pdf", 1, 3)
+
+    assert [item.item_key for item in items] == ["材料A"]
+    assert items[0].reference_number == "内1号"